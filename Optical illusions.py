@@ -15,13 +15,19 @@
 # - Triangle-focused illusions: 1,2,3,4,5, 10 (at least five).
 #
 # Install:
-#   pip install pygame
+#   pip install pygame numpy
+#   pip install numba        (optional: JIT kernels for the heaviest presets)
 # Run:
 #   python illusions25.py
 
 import math, random, sys
+import numpy as np
 import pygame
-from pygame import gfxdraw
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
 
 # -------------- Setup -------------- #
 W, H = 1200, 800
@@ -39,31 +45,94 @@ speed   = 1.0    # 0.25 .. 3.0
 use_trails = True
 show_help  = True
 
-# Trail surface for persistence
-trail = pygame.Surface((W, H), pygame.SRCALPHA)
-trail.fill((0,0,0,0))
+def make_layer(size, fill=(0,0,0,0)):
+    s = pygame.Surface(size, pygame.SRCALPHA)
+    s.fill(fill)
+    return s
 
-def clamp(a, lo, hi): return lo if a<lo else hi if a>hi else a
+def make_target(size):
+    s = pygame.Surface(size).convert()
+    s.fill((6,8,12))
+    return s
+
+# Presets draw into a persistent target that is blitted to the screen once
+# per frame; with trails on it is dimmed in place instead of recomposited.
+target = make_target((W, H))
+fader = make_layer((W, H), (0,0,0,24))     # per-frame trail dimming
+fade_soft = make_layer((W, H), (0,0,0,12)) # draw_bg_fade
+ghost = make_layer((W, H))                 # scratch layer for alpha outlines
+
+def clamp(a, lo, hi): return max(lo, min(hi, a))
 
 def polar(cx, cy, ang, rad):
     return cx + math.cos(ang)*rad, cy + math.sin(ang)*rad
 
+def polar_np(cx, cy, ang, rad):
+    # polar() over whole arrays of angles/radii
+    return cx + np.cos(ang)*rad, cy + np.sin(ang)*rad
+
 def draw_pixel(x, y, c):
     # Tiny pixel/rect (2x2) for crisp "pixel art" feel
-    pygame.draw.rect(screen, c, (int(x), int(y), 2, 2))
+    pygame.draw.rect(target, c, (int(x), int(y), 2, 2))
+
+def draw_pixels(xs, ys, c, size=2):
+    # Vectorized draw_pixel: scatter size x size dots straight into the pixel
+    # buffer. c is one (r,g,b) or an (n,3) array of per-dot colors.
+    w,h = target.get_size()
+    x = np.asarray(xs).astype(int); y = np.asarray(ys).astype(int)
+    c = np.asarray(c, np.uint8)
+    arr = pygame.surfarray.pixels3d(target)
+    for dy in range(size):
+        for dx in range(size):
+            xx = x+dx; yy = y+dy
+            ok = (xx >= 0) & (xx < w) & (yy >= 0) & (yy < h)
+            arr[xx[ok], yy[ok]] = c[ok] if c.ndim == 2 else c
+    del arr  # unlock the surface
 
 def draw_line(a, b, c, w=1):
-    pygame.draw.line(screen, c, a, b, w)
+    pygame.draw.line(target, c, a, b, w)
+
+def draw_segments(x1, y1, x2, y2, c):
+    # Independent segments from endpoint arrays; one tight loop, no trig per line
+    for ax, ay, bx, by in np.stack(np.broadcast_arrays(x1, y1, x2, y2), axis=-1).reshape(-1, 4).tolist():
+        pygame.draw.line(target, c, (ax,ay), (bx,by), 1)
 
 def draw_poly(pts, c, fill=False, w=1):
     if fill:
-        pygame.draw.polygon(screen, c, pts, 0)
+        pygame.draw.polygon(target, c, pts, 0)
     else:
-        pygame.draw.polygon(screen, c, pts, w)
+        pygame.draw.polygon(target, c, pts, w)
 
 def tri(cx, cy, r, rot=0):
     return [polar(cx, cy, rot + i*2*math.pi/3, r) for i in range(3)]
 
+def tri_np(cx, cy, r, rot):
+    # Vertices of N triangles at once -> (N,3,2)
+    ang = np.asarray(rot)[:,None] + np.arange(3)*2*math.pi/3
+    x, y = polar_np(cx, cy, ang, np.asarray(r)[:,None])
+    return np.stack([x, y], axis=-1)
+
+def ring_index(counts):
+    # Flattened (ring, k) index pairs for rings holding counts[ring] elements
+    ring = np.repeat(np.arange(len(counts)), counts)
+    k = np.arange(counts.sum()) - np.repeat(np.cumsum(counts)-counts, counts)
+    return ring, k
+
+# Unit circles sampled once; rings are rotated/scaled copies of these
+def unit_circle(n):
+    a = np.arange(n)/n*2*math.pi
+    return np.cos(a), np.sin(a)
+
+_UNIT36 = unit_circle(36)
+_UNIT12 = unit_circle(12)
+
+def rotate_unit(unit, ang, rad, cx, cy):
+    # Rotate a cached unit circle by per-ring angles -> (rings, n) x, y
+    ux, uy = unit
+    c = np.cos(ang)[:,None]; s = np.sin(ang)[:,None]
+    rad = np.asarray(rad)[:,None]
+    return cx + rad*(c*ux - s*uy), cy + rad*(s*ux + c*uy)
+
 def map_range(v, a, b, c, d):
     if b - a == 0: return c
     t = (v - a) / (b - a)
@@ -74,18 +143,121 @@ def grid_iter(cols, rows, pad=0):
         for i in range(cols):
             yield i, j
 
-# Pseudo-random but stable palette per preset
-def color_wheel(t):
-    # smooth cycling RGB 0..1
-    r = 0.5+0.5*math.sin(t)
-    g = 0.5+0.5*math.sin(t+2.094)
-    b = 0.5+0.5*math.sin(t+4.188)
-    return int(r*255), int(g*255), int(b*255)
+# Pseudo-random but stable palette per preset: smooth cycling RGB, sampled
+# once into a 256-entry table indexed by phase (256 steps per 2*pi)
+_WHEEL_PHASE = np.arange(256)/256*2*np.pi
+WHEEL_LUT = (255*(0.5+0.5*np.sin(_WHEEL_PHASE[:,None] + (0, 2.094, 4.188)))).astype(np.uint8)
+_WHEEL_K = 256/(2*math.pi)
+
+def color_wheel_np(t):
+    # Palette colors for an array of phases -> (n,3) uint8. Floor, not
+    # truncate, so counter-rotating (negative) phases round to nearest too.
+    return WHEEL_LUT[np.floor(np.asarray(t)*_WHEEL_K + 0.5).astype(int) & 255]
+
+# Grid-sized surface reused by blit_grid while the grid shape holds
+_grid_surf = None
+
+def blit_grid(rgb):
+    # Upscale a (cols, rows, 3) uint8 color grid straight into the target
+    global _grid_surf
+    if _grid_surf is None or _grid_surf.get_size() != rgb.shape[:2]:
+        _grid_surf = pygame.Surface(rgb.shape[:2]).convert()
+    pygame.surfarray.blit_array(_grid_surf, rgb)
+    pygame.transform.scale(_grid_surf, target.get_size(), target)
+
+# -------------- Optional JIT kernels -------------- #
+# Each kernel has a NumPy fallback in its preset when numba is missing.
+
+if HAVE_NUMBA:
+    @njit(fastmath=True, cache=True)
+    def wave_kernel(out, t, s1, s2):
+        # out: (cols, rows, 3) uint8 grid for draw_wave_interf. Grids are only
+        # a few thousand cells, so a serial loop beats prange's thread startup.
+        cols, rows = out.shape[0], out.shape[1]
+        cj = np.empty(rows)
+        for j in range(rows):
+            cj[j] = math.cos(j*0.15*s2 + t*1.1) + 2
+        for i in range(cols):
+            si = math.sin(i*0.18*s1 + t*0.9)
+            for j in range(rows):
+                c = (si + cj[j])*(215/4) + 20
+                out[i,j,0] = c; out[i,j,1] = c; out[i,j,2] = c
+
+    @njit(inline='always')
+    def put_dot(arr, x, y, g):
+        # 2x2 grey dot, clipped to the (w, h, 3) pixel buffer
+        for dy in range(2):
+            for dx in range(2):
+                px = x+dx; py = y+dy
+                if 0 <= px < arr.shape[0] and 0 <= py < arr.shape[1]:
+                    arr[px,py,0] = g; arr[px,py,1] = g; arr[px,py,2] = g
+
+    @njit(fastmath=True, cache=True)
+    def radial_tunnel_kernel(arr, t, speed, n, cx, cy):
+        # arr: pixels3d view of target for draw_radial_tunnel
+        for i in range(n):
+            a = t*speed*0.6 + i*0.08
+            r = 2 + i*2
+            put_dot(arr, int(cx + math.cos(a)*r), int(cy + math.sin(a)*r),
+                    int(140 + 115*math.sin(i*0.1 + t)))
+
+    @njit(fastmath=True, cache=True)
+    def vortex_kernel(arr, t, speed, arms, segs, cx, cy):
+        # arr: pixels3d view of target for draw_vortex_dashes
+        for aidx in range(arms):
+            base = aidx/arms*2*math.pi + t*speed*0.2
+            for k in range(segs):
+                a = base + k*0.06
+                r = 6 + k*3
+                put_dot(arr, int(cx + math.cos(a)*r), int(cy + math.sin(a)*r),
+                        240 if k%2 == 0 else 40)
+
+    # compile up front so the first frame of a preset doesn't stall. The
+    # pixel kernels get a pixels3d view of target, which is non-contiguous
+    # (layout 'A'); warm them with one so numba reuses that specialization.
+    wave_kernel(np.zeros((2,2,3), np.uint8), 0.0, 1.0, 1.0)
+    _warm = pygame.surfarray.pixels3d(target)
+    radial_tunnel_kernel(_warm, 0.0, 1.0, 1, 0.0, 0.0)
+    vortex_kernel(_warm, 0.0, 1.0, 1, 1, 0.0, 0.0)
+    del _warm  # unlock the surface
+    target.fill((6,8,12))  # wipe the warm-up dots
+
+_wave_buf = np.zeros((0,0,3), np.uint8)
+
+# Checkerboards only change with grid shape/size; keep the last one built
+_checker_cache = {}
+
+def checker_surface(cols, rows, size, hi, lo):
+    key = (cols, rows, size, hi, lo)
+    if key not in _checker_cache:
+        _checker_cache.clear()
+        odd = (np.add.outer(np.arange(cols), np.arange(rows)) & 1).astype(bool)
+        grid = np.where(odd, lo, hi).astype(np.uint8)
+        small = pygame.surfarray.make_surface(np.repeat(grid[:,:,None], 3, axis=2))
+        _checker_cache[key] = pygame.transform.scale(small, size)
+    return _checker_cache[key]
+
+# 1px ring sprites for draw_hex_moire, rebuilt only when the radius changes
+_ring_cache = {}
+
+def ring_sprite(rad, c):
+    key = (rad, c)
+    if key not in _ring_cache:
+        if any(r != rad for r, _ in _ring_cache):
+            _ring_cache.clear()  # radius changed: drop the old pair
+        s = pygame.Surface((2*rad+2, 2*rad+2)).convert()
+        s.fill((0,0,0))
+        pygame.draw.circle(s, c, (rad,rad), rad, 1)
+        s.set_colorkey((0,0,0), pygame.RLEACCEL)
+        _ring_cache[key] = s
+    return _ring_cache[key]
 
 def alpha_blit(src, alpha):
-    s = src.copy()
-    s.set_alpha(alpha)
-    screen.blit(s, (0,0))
+    # Temporarily set surface alpha instead of blitting a full copy
+    prev = src.get_alpha()
+    src.set_alpha(alpha)
+    target.blit(src, (0,0))
+    src.set_alpha(prev)
 
 # -------------- Preset drawers -------------- #
 # Each function: draw_X(t, rnd, parms)
@@ -95,34 +267,33 @@ def draw_bg_fade():
     # Slight fade for trails
     if use_trails:
         # gentle alpha to let older pixels persist
-        fade = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
-        fade.fill((0,0,0,12))
-        screen.blit(fade, (0,0))
+        target.blit(fade_soft, (0,0))
     else:
-        screen.fill((6,8,12))
+        target.fill((6,8,12))
 
 # --- 1. Triangle Kaleido Orbit (triangle) --- #
 def draw_tri_kaleido(t, rnd, p):
-    w,h = screen.get_size()
+    w,h = target.get_size()
     cx, cy = w/2, h/2
     N = int(60 * p['density'])
     base = min(w,h)/3
-    for k in range(N):
-        a = t*p['speed']*0.8 + k*0.17
-        r = base*(0.25+0.7*math.sin(a*2 + k*0.11)**2)
-        rot = a + k*0.2
-        pts = tri(cx, cy, r, rot)
-        col = color_wheel(a*1.8 + k*0.3)
+    k = np.arange(N)
+    a = t*p['speed']*0.8 + k*0.17
+    r = base*(0.25+0.7*np.sin(a*2 + k*0.11)**2)
+    rot = a + k*0.2
+    tris = tri_np(cx, cy, r, rot).tolist()
+    cols = color_wheel_np(a*1.8 + k*0.3).tolist()
+    for pts, col in zip(tris, cols):
         draw_poly(pts, col, False, 1)
 
 # --- 2. Kanizsa Tri Implied (triangle) --- #
 def draw_kanizsa_triangle(t, rnd, p):
-    w,h = screen.get_size()
+    w,h = target.get_size()
     cx, cy = w/2, h/2
     r = min(w,h)*0.28
     # background softly pulses
     bgc = int(14+10*math.sin(t*0.8))
-    pygame.draw.rect(screen, (bgc,bgc,bgc), (0,0,w,h))
+    pygame.draw.rect(target, (bgc,bgc,bgc), (0,0,w,h))
     # three pacman disks to imply a triangle
     for i in range(3):
         ang = t*0.2 + i*2*math.pi/3
@@ -132,377 +303,403 @@ def draw_kanizsa_triangle(t, rnd, p):
         start = ang + math.pi/6 + math.sin(t*0.6+i)*0.5
         end   = start + math.pi*1.65
         col = (235,235,235)
-        pygame.draw.circle(screen, col, (int(x),int(y)), int(rad))
+        pygame.draw.circle(target, col, (int(x),int(y)), int(rad))
         # erase wedge
-        pygame.draw.arc(screen, (bgc,bgc,bgc), (x-rad, y-rad, rad*2, rad*2), start, end, int(rad))
+        pygame.draw.arc(target, (bgc,bgc,bgc), (x-rad, y-rad, rad*2, rad*2), start, end, int(rad))
     # ghost triangle outline flicker
     alpha = int(40+40*(0.5+0.5*math.sin(t*2)))
-    s = pygame.Surface((w,h), pygame.SRCALPHA)
-    pygame.draw.polygon(s, (255,255,255,alpha), tri(cx,cy,r*0.92), 4)
-    screen.blit(s,(0,0))
+    # only the outline's bounding box is blitted, then cleared for reuse
+    box = pygame.draw.polygon(ghost, (255,255,255,alpha), tri(cx,cy,r*0.92), 4)
+    target.blit(ghost, box, box)
+    ghost.fill((0,0,0,0), box)
 
 # --- 3. Triangle Moiré Field (triangle) --- #
 def draw_triangle_moire(t, rnd, p):
-    w,h = screen.get_size()
+    w,h = target.get_size()
     cols = int(28 * p['density'])
     rows = int(cols * h/w)
     cell = w/cols
     phase = t*p['speed']*1.2
-    for j in range(rows):
-        for i in range(cols):
-            x = i*cell + cell/2
-            y = j*cell + cell/2
-            r = 0.45*cell*(1+0.6*math.sin(phase + (i*0.3) + (j*0.31)))
-            rot = phase*0.5 + (i-j)*0.15
-            pts = tri(x,y,r,rot)
-            c = int(130+120*math.sin(phase + i*0.2 + j*0.19))
-            pygame.draw.polygon(screen, (c,c,c), pts, 1)
+    j, i = [g.ravel() for g in np.mgrid[0:rows, 0:cols]]
+    x = i*cell + cell/2
+    y = j*cell + cell/2
+    r = 0.45*cell*(1+0.6*np.sin(phase + (i*0.3) + (j*0.31)))
+    rot = phase*0.5 + (i-j)*0.15
+    # tri_np around the origin, then offset each triangle to its cell
+    tris = tri_np(0, 0, r, rot) + np.stack([x, y], axis=-1)[:,None,:]
+    shade = (130+120*np.sin(phase + i*0.2 + j*0.19)).astype(int).tolist()
+    for pts, c in zip(tris.tolist(), shade):
+        pygame.draw.polygon(target, (c,c,c), pts, 1)
 
 # --- 4. Penrose-ish Rotate (triangle feel) --- #
 def draw_penrose_suggest(t, rnd, p):
-    w,h = screen.get_size()
+    w,h = target.get_size()
     cx,cy = w/2,h/2
     rings = int(16 * p['density'])
-    for r in range(rings):
-        rad = map_range(r, 0, rings-1, min(w,h)*0.05, min(w,h)*0.48)
-        segs = 3* (4 + (r%3))
-        for k in range(segs):
-            a = (k/segs)*2*math.pi + t*p['speed']*0.3*(1 if r%2 else -1)
-            x1,y1 = polar(cx,cy,a,rad)
-            x2,y2 = polar(cx,cy,a+2*math.pi/3, rad)
-            # thin triangle wedge
-            col = color_wheel(a*2 + r*0.3)
-            pygame.draw.line(screen, col, (x1,y1), (x2,y2), 1)
+    segs = 3* (4 + (np.arange(rings)%3))
+    r, k = ring_index(segs)
+    rad = map_range(r, 0, rings-1, min(w,h)*0.05, min(w,h)*0.48)
+    a = (k/segs[r])*2*math.pi + t*p['speed']*0.3*np.where(r%2, 1, -1)
+    x1,y1 = polar_np(cx,cy,a,rad)
+    x2,y2 = polar_np(cx,cy,a+2*math.pi/3, rad)
+    # thin triangle wedge
+    cols = color_wheel_np(a*2 + r*0.3).tolist()
+    for seg, col in zip(np.stack([x1,y1,x2,y2], axis=-1).tolist(), cols):
+        pygame.draw.line(target, col, seg[:2], seg[2:], 1)
 
 # --- 5. Triangle Spiral Tunnel (triangle) --- #
 def draw_tri_spiral_tunnel(t, rnd, p):
-    w,h = screen.get_size()
+    w,h = target.get_size()
     cx,cy = w/2,h/2
     layers = int(140 * p['density'])
-    for i in range(layers):
-        s = map_range(i, 0, layers, min(w,h)*0.5, 6)
-        rot = t*p['speed']*0.8 + i*0.21
-        pts = tri(cx,cy,s,rot)
-        col = (int(160+95*math.sin(i*0.1 + t)),)*3
-        pygame.draw.polygon(screen, col, pts, 1)
+    i = np.arange(layers)
+    s = map_range(i, 0, layers, min(w,h)*0.5, 6)
+    rot = t*p['speed']*0.8 + i*0.21
+    shade = (160+95*np.sin(i*0.1 + t)).astype(int).tolist()
+    for pts, c in zip(tri_np(cx,cy,s,rot).tolist(), shade):
+        pygame.draw.polygon(target, (c,c,c), pts, 1)
 
 # --- 6. Café Wall Warp --- #
 def draw_cafe_wall(t, rnd, p):
-    w,h = screen.get_size()
+    w,h = target.get_size()
     rows = int(18 * p['density'])
     cols = rows*2
     cell = h/rows
     phase = t*p['speed']*0.8
+    board = checker_surface(cols, rows, (round(cols*cell), round(rows*cell)), 255, 20)
+    bw = board.get_width()
+    # shift whole rows of the cached board instead of drawing each tile
     for j in range(rows):
         off = (j%2)* (cell*0.4*math.sin(phase+j*0.2))
-        for i in range(cols):
-            x = i*cell + off
-            y = j*cell
-            c = 255 if (i+j)%2==0 else 20
-            pygame.draw.rect(screen, (c,c,c), (x,y,cell,cell))
-    # horizontal mortar lines
+        y0, y1 = int(j*cell), int((j+1)*cell)
+        target.blit(board, (off, y0), (0, y0, bw, y1-y0))
+    # horizontal mortar lines (2px fills match a width-2 draw.line exactly)
     for j in range(rows+1):
-        y = j*cell
-        pygame.draw.line(screen, (80,80,80), (0,y), (w,y), 2)
+        target.fill((80,80,80), (0, int(j*cell), w, 2))
 
 # --- 7. Bulge Grid (Hermann-like) --- #
 def draw_bulge_grid(t, rnd, p):
-    w,h = screen.get_size()
+    w,h = target.get_size()
     cols = int(36 * p['density'])
     rows = int(cols*h/w)
     cellx = w/cols
     celly = h/rows
-    for j in range(rows+1):
-        vag = math.sin(t*p['speed']*0.6 + j*0.3)*10
-        pygame.draw.line(screen, (200,200,200), (0, j*celly+vag), (w, j*celly-vag), 1)
-    for i in range(cols+1):
-        vag = math.sin(t*p['speed']*0.7 + i*0.3)*10
-        pygame.draw.line(screen, (200,200,200), (i*cellx+vag, 0), (i*cellx-vag, h), 1)
+    y = np.arange(rows+1)*celly
+    vag = np.sin(t*p['speed']*0.6 + np.arange(rows+1)*0.3)*10
+    draw_segments(0, y+vag, w, y-vag, (200,200,200))
+    x = np.arange(cols+1)*cellx
+    vag = np.sin(t*p['speed']*0.7 + np.arange(cols+1)*0.3)*10
+    draw_segments(x+vag, 0, x-vag, h, (200,200,200))
 
 # --- 8. Radiant Lines (Hering) --- #
 def draw_radiant(t, rnd, p):
-    w,h = screen.get_size()
+    w,h = target.get_size()
     cx,cy = w/2,h/2
     rays = int(220 * p['density'])
-    for k in range(rays):
-        a = k/rays*2*math.pi
-        x,y = polar(cx,cy,a, min(w,h)*0.6)
-        c = (120+int(120*math.sin(t+p['speed']*k*0.02)),)*3
-        draw_line((cx,cy),(x,y),c,1)
+    k = np.arange(rays)
+    a = k/rays*2*math.pi
+    xs = cx + np.cos(a)*min(w,h)*0.6
+    ys = cy + np.sin(a)*min(w,h)*0.6
+    shade = 120 + np.trunc(120*np.sin(t+p['speed']*k*0.02)).astype(int)
+    for x, y, c in zip(xs.tolist(), ys.tolist(), shade.tolist()):
+        draw_line((cx,cy),(x,y),(c,c,c),1)
     # central circles that appear warped
     for r in range(12):
         rad = 14 + r*14 + 6*math.sin(t*0.8+r*0.3)
-        pygame.draw.circle(screen, (240,240,240), (int(cx),int(cy)), int(rad), 2)
+        pygame.draw.circle(target, (240,240,240), (int(cx),int(cy)), int(rad), 2)
 
 # --- 9. Spiral vs Circles (Fraser-ish) --- #
 def draw_fraser(t, rnd, p):
-    w,h = screen.get_size()
+    w,h = target.get_size()
     cx,cy = w/2,h/2
     rounds = int(56 * p['density'])
-    for r in range(rounds):
-        rad = 12 + r*10
-        twist = 0.5*math.sin(t*0.9 + r*0.25)
-        for k in range(36):
-            a = k/36*2*math.pi + twist
-            x,y = polar(cx,cy,a,rad)
-            draw_pixel(x,y,(240,240,240))
-        # dashes to confuse orientation
-        for k in range(12):
-            a = k/12*2*math.pi - twist*1.6
-            x1,y1 = polar(cx,cy,a,rad-6)
-            x2,y2 = polar(cx,cy,a+0.08,rad+6)
-            pygame.draw.line(screen, (80,80,80), (x1,y1),(x2,y2),1)
+    r = np.arange(rounds)
+    rad = 12 + r*10
+    twist = 0.5*np.sin(t*0.9 + r*0.25)
+    x,y = rotate_unit(_UNIT36, twist, rad, cx, cy)
+    draw_pixels(x, y, (240,240,240))
+    # dashes to confuse orientation
+    x1,y1 = rotate_unit(_UNIT12, -twist*1.6, rad-6, cx, cy)
+    x2,y2 = rotate_unit(_UNIT12, -twist*1.6+0.08, rad+6, cx, cy)
+    draw_segments(x1, y1, x2, y2, (80,80,80))
 
 # --- 10. Tri Chroma Drift (triangle) --- #
 def draw_tri_chroma_drift(t, rnd, p):
-    w,h = screen.get_size()
+    w,h = target.get_size()
     cx,cy=w/2,h/2
     N=int(120*p['density'])
     base=min(w,h)*0.48
-    for i in range(N):
-        s=base*(i/N)
-        rot=t*p['speed']*0.6 + i*0.07
-        pts=tri(cx,cy,s,rot)
-        rr,gg,bb=color_wheel(i*0.1 + t*1.2)
-        # RGB slight offsets to induce motion illusion
-        off=1.5+0.8*math.sin(t+i*0.2)
-        draw_poly([(x+off,y) for (x,y) in pts], (rr,0,0), False,1)
-        draw_poly([(x,y+off) for (x,y) in pts], (0,gg,0), False,1)
-        draw_poly([(x-off,y-off) for (x,y) in pts], (0,0,bb), False,1)
+    i=np.arange(N)
+    tris=tri_np(cx,cy,base*(i/N),t*p['speed']*0.6 + i*0.07)
+    cols=color_wheel_np(i*0.1 + t*1.2).tolist()
+    # RGB slight offsets to induce motion illusion
+    off=(1.5+0.8*np.sin(t+i*0.2))[:,None,None]
+    red=(tris + off*np.array([1,0])).tolist()
+    green=(tris + off*np.array([0,1])).tolist()
+    blue=(tris - off).tolist()
+    for k,(rr,gg,bb) in enumerate(cols):
+        draw_poly(red[k], (rr,0,0), False,1)
+        draw_poly(green[k], (0,gg,0), False,1)
+        draw_poly(blue[k], (0,0,bb), False,1)
 
 # --- 11. Rotating Snakes-ish --- #
 def draw_rot_snakes(t, rnd, p):
-    w,h = screen.get_size()
+    w,h = target.get_size()
     cx,cy=w/2,h/2
     rings = int(10*p['density'])+6
     seg = 36
+    step = 2*math.pi/seg
+    # 8-color loop for drift
+    palette = [ (235,64,64), (255,200,0), (240,240,240), (40,40,40),
+                (64,64,235), (0,180,255), (240,240,240), (40,40,40) ]
+    arc = pygame.draw.arc
     for r in range(1,rings+1):
         R = r*min(w,h)*0.045 + 40
+        box = (cx-R,cy-R,R*2,R*2)
+        # arc rotates subtly
+        rot = t*p['speed']*0.3*(1 if r%2 else -1)
         for k in range(seg):
-            a = (k/seg)*2*math.pi
-            # 8-color loop for drift
-            idx = (k + r*2) % 8
-            c = [ (235,64,64), (255,200,0), (240,240,240), (40,40,40),
-                  (64,64,235), (0,180,255), (240,240,240), (40,40,40) ][idx]
-            # arc rotates subtly
-            rot = t*p['speed']*0.3*(1 if r%2 else -1)
-            x1,y1=polar(cx,cy,a+rot,R-14)
-            x2,y2=polar(cx,cy,a+rot+2*math.pi/seg,R+14)
-            pygame.draw.arc(screen, c, (cx-R,cy-R,R*2,R*2), a+rot, a+rot+2*math.pi/seg, 10)
+            a = k*step + rot
+            arc(target, palette[(k + r*2) % 8], box, a, a+step, 10)
 
 # --- 12. Offset Checkerboard (breathing) --- #
 def draw_checker_breathe(t, rnd, p):
-    w,h=screen.get_size()
+    w,h=target.get_size()
     cols=int(22*p['density'])
     rows=int(cols*h/w)
-    cw=w/cols; ch=h/rows
+    ch=h/rows
     off = 0.5*math.sin(t*p['speed']*2)
+    board = checker_surface(cols, rows, (w, h), 255, 10)
     for j in range(rows):
-        for i in range(cols):
-            x=i*cw + (ch*0.4 if j%2 else -ch*0.4)*off
-            y=j*ch
-            c=255 if (i+j)%2==0 else 10
-            pygame.draw.rect(screen,(c,c,c),(x,y,cw,ch))
+        x=(ch*0.4 if j%2 else -ch*0.4)*off
+        y0, y1 = int(j*ch), int((j+1)*ch)
+        target.blit(board, (x, y0), (0, y0, w, y1-y0))
 
 # --- 13. Radial Tunnel (pixel) --- #
 def draw_radial_tunnel(t, rnd, p):
-    w,h=screen.get_size()
+    w,h=target.get_size()
     cx,cy=w/2,h/2
     rings=int(320*p['density'])
-    for i in range(rings):
-        a=t*p['speed']*0.6 + i*0.08
-        r=2+i*2
-        x,y=polar(cx,cy,a,r)
-        col=(int(140+115*math.sin(i*0.1+t)),)*3
-        draw_pixel(x,y,col)
+    if HAVE_NUMBA:
+        arr=pygame.surfarray.pixels3d(target)
+        radial_tunnel_kernel(arr, t, p['speed'], rings, cx, cy)
+        del arr
+        return
+    i=np.arange(rings)
+    a=t*p['speed']*0.6 + i*0.08
+    r=2+i*2
+    col=(140+115*np.sin(i*0.1+t)).astype(np.uint8)
+    draw_pixels(cx+np.cos(a)*r, cy+np.sin(a)*r, np.repeat(col[:,None], 3, axis=1))
 
 # --- 14. Hex Moiré Drift --- #
 def draw_hex_moire(t, rnd, p):
-    w,h=screen.get_size()
+    w,h=target.get_size()
     size=16/max(0.5,p['density']*0.8)
     dx=size*math.sqrt(3); dy=size*1.5
     cols=int(w/dx)+2; rows=int(h/dy)+2
     ph=t*p['speed']*0.5
-    for j in range(rows):
-        for i in range(cols):
-            x=i*dx + (j%2)*dx/2 + math.sin(ph+i*0.3+j*0.2)*6
-            y=j*dy + math.cos(ph+i*0.2+j*0.3)*3
-            c=(200,200,200) if (i+j)%2==0 else (50,50,50)
-            pygame.draw.circle(screen,c,(int(x),int(y)),int(size),1)
+    j, i = [g.ravel() for g in np.mgrid[0:rows, 0:cols]]
+    x=i*dx + (j%2)*dx/2 + np.sin(ph+i*0.3+j*0.2)*6
+    y=j*dy + np.cos(ph+i*0.2+j*0.3)*3
+    # rings are identical apart from position: blit two cached sprites
+    rad=int(size)
+    pos=np.stack([x.astype(int)-rad, y.astype(int)-rad], axis=-1)
+    sprites=(ring_sprite(rad,(200,200,200)), ring_sprite(rad,(50,50,50)))
+    target.blits([(sprites[k], xy) for k, xy in zip(((i+j)%2).tolist(), pos.tolist())], doreturn=False)
 
 # --- 15. Wave Interference (two fields) --- #
 def draw_wave_interf(t, rnd, p):
-    w,h=screen.get_size()
+    w,h=target.get_size()
     cols=int(110*p['density'])
     rows=int(cols*h/w)
-    cw=w/cols; ch=h/rows
     s1= (math.sin(t*p['speed']*0.8)+1.2)
     s2= (math.cos(t*p['speed']*0.7)+1.2)
-    for j in range(rows):
-        for i in range(cols):
-            val = math.sin(i*0.18*s1 + t*0.9) + math.cos(j*0.15*s2 + t*1.1)
-            c = int(map_range(val, -2, 2, 20, 235))
-            pygame.draw.rect(screen,(c,c,c),(i*cw,j*ch,cw,ch))
+    # whole field at once: (cols, rows) intensity, upscaled to the target
+    if HAVE_NUMBA:
+        global _wave_buf
+        if _wave_buf.shape[:2] != (cols, rows):
+            _wave_buf = np.zeros((cols, rows, 3), np.uint8)
+        wave_kernel(_wave_buf, t, s1, s2)
+        blit_grid(_wave_buf)
+        return
+    i_axis = np.arange(cols)[:,None]*0.18*s1
+    j_axis = np.arange(rows)[None,:]*0.15*s2
+    val = np.sin(i_axis + t*0.9) + np.cos(j_axis + t*1.1)
+    c = ((val+2)*(215/4)+20).astype(np.uint8)
+    blit_grid(np.repeat(c[:,:,None], 3, axis=2))
 
 # --- 16. Lissajous Dot Field --- #
 def draw_lissajous_field(t, rnd, p):
-    w,h=screen.get_size()
+    w,h=target.get_size()
     n=int(420*p['density'])
-    for i in range(n):
-        a=i*0.07
-        x = w/2 + math.sin(t*p['speed']*1.1 + a*3)*w*0.38*math.sin(a*0.3)
-        y = h/2 + math.cos(t*p['speed']*1.3 + a*4)*h*0.28*math.cos(a*0.2)
-        col=color_wheel(a*0.7+t*1.2)
-        draw_pixel(x,y,col)
+    a=np.arange(n)*0.07
+    x = w/2 + np.sin(t*p['speed']*1.1 + a*3)*w*0.38*np.sin(a*0.3)
+    y = h/2 + np.cos(t*p['speed']*1.3 + a*4)*h*0.28*np.cos(a*0.2)
+    draw_pixels(x, y, color_wheel_np(a*0.7+t*1.2))
 
 # --- 17. Vortex Spiral Dashes --- #
 def draw_vortex_dashes(t, rnd, p):
-    w,h=screen.get_size()
+    w,h=target.get_size()
     cx,cy=w/2,h/2
     arms=int(16*p['density'])+12
     segs=140
-    for aidx in range(arms):
-        base=aidx/arms*2*math.pi + t*p['speed']*0.2
-        for k in range(segs):
-            r=6+k*3
-            a=base + k*0.06
-            x,y=polar(cx,cy,a,r)
-            if k%2==0:
-                draw_pixel(x,y,(240,240,240))
-            else:
-                draw_pixel(x,y,(40,40,40))
+    if HAVE_NUMBA:
+        arr=pygame.surfarray.pixels3d(target)
+        vortex_kernel(arr, t, p['speed'], arms, segs, cx, cy)
+        del arr
+        return
+    base=np.arange(arms)[:,None]/arms*2*math.pi + t*p['speed']*0.2
+    k=np.arange(segs)[None,:]
+    r=6+k*3
+    a=base + k*0.06
+    x=cx+np.cos(a)*r; y=cy+np.sin(a)*r
+    # even segments light, odd dark
+    draw_pixels(x[:,0::2], y[:,0::2], (240,240,240))
+    draw_pixels(x[:,1::2], y[:,1::2], (40,40,40))
 
 # --- 18. Concentric Zig Rings --- #
 def draw_zig_rings(t, rnd, p):
-    w,h=screen.get_size()
+    w,h=target.get_size()
     cx,cy=w/2,h/2
     rings=int(42*p['density'])
+    _sin=math.sin; _cos=math.cos
+    spin=t*p['speed']*0.3
     for r in range(1,rings+1):
         R=r*10
         pts=[]
-        zig= int(10 + 10*math.sin(t*0.7 + r))
+        zig= int(10 + 10*_sin(t*0.7 + r))
         for k in range(zig):
-            a=k/zig*2*math.pi + r*0.11 + t*p['speed']*0.3
-            jitter = 4*math.sin(k*0.7 + r*0.3 + t)
-            x,y=polar(cx,cy,a,R+jitter)
-            pts.append((x,y))
-        pygame.draw.polygon(screen,(220,220,220),pts,1)
+            a=k/zig*2*math.pi + r*0.11 + spin
+            rad=R + 4*_sin(k*0.7 + r*0.3 + t)
+            pts.append((cx + _cos(a)*rad, cy + _sin(a)*rad))
+        pygame.draw.polygon(target,(220,220,220),pts,1)
 
 # --- 19. Chromatic Grid Drift --- #
 def draw_chroma_grid(t, rnd, p):
-    w,h=screen.get_size()
+    w,h=target.get_size()
     cols=int(36*p['density'])
     rows=int(cols*h/w)
     cw=w/cols; ch=h/rows
-    for j in range(rows):
-        for i in range(cols):
-            a=t*p['speed'] + i*0.2 + j*0.21
-            x=i*cw; y=j*ch
-            rr=int(120+120*math.sin(a))
-            gg=int(120+120*math.sin(a+2))
-            bb=int(120+120*math.sin(a+4))
-            pygame.draw.rect(screen,(rr,gg,bb),(x,y,cw-1,ch-1))
+    a=t*p['speed'] + np.arange(cols)[:,None]*0.2 + np.arange(rows)[None,:]*0.21
+    rr=(120+120*np.sin(a)).astype(np.uint8)
+    gg=(120+120*np.sin(a+2)).astype(np.uint8)
+    bb=(120+120*np.sin(a+4)).astype(np.uint8)
+    blit_grid(np.stack([rr,gg,bb], axis=-1))
+    # 1px gutters between cells
+    for i in range(1,cols+1):
+        x=i*cw-1
+        pygame.draw.line(target,(6,8,12),(x,0),(x,h),1)
+    for j in range(1,rows+1):
+        y=j*ch-1
+        pygame.draw.line(target,(6,8,12),(0,y),(w,y),1)
 
 # --- 20. Pixel Tunnel Zoom --- #
 def draw_pixel_tunnel(t, rnd, p):
-    w,h=screen.get_size()
+    w,h=target.get_size()
     cx,cy=w/2,h/2
     n=int(1600*p['density'])
-    for i in range(n):
-        a=rnd.random()*2*math.pi
-        r=(i/n)**0.6 * (min(w,h)*0.5)
-        x,y=polar(cx,cy,a + t*p['speed']*0.15, r)
-        col=(int(100+155*(i/n)),)*3
-        draw_pixel(x,y,col)
+    rng=np.random.default_rng(rnd.getrandbits(32))
+    i=np.arange(n)/n
+    a=rng.random(n)*2*math.pi + t*p['speed']*0.15
+    r=i**0.6 * (min(w,h)*0.5)
+    col=(100+155*i).astype(np.uint8)
+    draw_pixels(cx+np.cos(a)*r, cy+np.sin(a)*r, np.repeat(col[:,None], 3, axis=1))
 
 # --- 21. Illusory Tilted Lines (Zöllner-ish) --- #
 def draw_zollner(t, rnd, p):
-    w,h=screen.get_size()
+    w,h=target.get_size()
     main_gap=int(48/p['density'])+6
     # main parallel lines
-    for y in range(0,h,main_gap):
-        pygame.draw.line(screen,(230,230,230),(0,y),(w,y),1)
+    y=np.arange(0,h,main_gap)
+    draw_segments(0, y, w, y, (230,230,230))
     # short skewers
     seg=int(24*p['density'])+12
-    for k in range(seg):
-        x=int(k*w/seg)
-        ang = 0.8*math.sin(t*p['speed']*0.7 + k*0.6)
-        for y in range(0,h,main_gap*2):
-            x1,y1 = x-18,y-10
-            x2,y2 = x+18,y+10
-            cs=math.cos(ang); sn=math.sin(ang)
-            cx,cy=x,(y+main_gap)
-            ax = cx + (x1-x)*cs - (y1-cy)*sn
-            ay = cy + (x1-x)*sn + (y1-cy)*cs
-            bx = cx + (x2-x)*cs - (y2-cy)*sn
-            by = cy + (x2-x)*sn + (y2-cy)*cs
-            pygame.draw.line(screen,(120,120,120),(ax,ay),(bx,by),1)
+    # skewer endpoints (x-18, y-10) and (x+18, y+10) rotated about the pivot
+    # (x, y+main_gap); the rotation only depends on the column, so the
+    # offsets are (seg,1) columns and each row is just two adds
+    k=np.arange(seg)[:,None]
+    x=(k*w/seg).astype(int)
+    ang=0.8*np.sin(t*p['speed']*0.7 + k*0.6)
+    cs=np.cos(ang); sn=np.sin(ang)
+    dx1 = -18*cs + (10+main_gap)*sn; dy1 = -18*sn - (10+main_gap)*cs
+    dx2 =  18*cs - (10-main_gap)*sn; dy2 =  18*sn + (10-main_gap)*cs
+    cy=np.arange(0,h,main_gap*2)[None,:] + main_gap
+    draw_segments(x+dx1, cy+dy1, x+dx2, cy+dy2, (120,120,120))
 
 # --- 22. Spiral Checker Twist --- #
 def draw_spiral_checker(t, rnd, p):
-    w,h=screen.get_size()
+    w,h=target.get_size()
     cx,cy=w/2,h/2
+    _sin=math.sin; _cos=math.cos
+    polygon=pygame.draw.polygon
+    colors=((255,255,255), (15,15,15))
+    spin=t*p['speed']*0.4
     for r in range(8, int(min(w,h)*0.6), 10):
         tiles=int(max(8, r/10))
+        step=2*math.pi/tiles
+        R=r+10; parity=r//10
+        # each tile's end angle is the next tile's start angle, so one
+        # cos/sin pair per tile covers all four corners
+        c0=_cos(spin); s0=_sin(spin)
         for k in range(tiles):
-            a=k/tiles*2*math.pi + t*p['speed']*0.4
-            x1,y1=polar(cx,cy,a,r)
-            x2,y2=polar(cx,cy,a+2*math.pi/tiles,r+10)
-            c=(255,255,255) if (k+(r//10))%2==0 else (15,15,15)
-            pygame.draw.polygon(screen,c,[(x1,y1),(x2,y2),
-                                          polar(cx,cy,a+2*math.pi/tiles,r),
-                                          polar(cx,cy,a,r+10)],0)
+            a2=(k+1)*step + spin
+            c1=_cos(a2); s1=_sin(a2)
+            polygon(target, colors[(k+parity)%2],
+                    [(cx+c0*r,cy+s0*r), (cx+c1*R,cy+s1*R),
+                     (cx+c1*r,cy+s1*r), (cx+c0*R,cy+s0*R)], 0)
+            c0=c1; s0=s1
 
 # --- 23. Impossible Steps (Escher-ish) --- #
 def draw_impossible_steps(t, rnd, p):
-    w,h=screen.get_size()
+    w,h=target.get_size()
     cx,cy=w/2,h/2
     # a rotating 4-segment "stair" ring
     R=min(w,h)*0.28
     segs=36
     rot=t*p['speed']*0.4
+    _sin=math.sin; _cos=math.cos
+    R2=R+26
     for s in range(segs):
         a0= (s/segs)*2*math.pi + rot
         a1= ((s+1)/segs)*2*math.pi + rot
-        x0,y0=polar(cx,cy,a0,R)
-        x1,y1=polar(cx,cy,a1,R)
-        x2,y2=polar(cx,cy,a1,R+26)
-        x3,y3=polar(cx,cy,a0,R+26)
+        c0,s0=_cos(a0),_sin(a0)
+        c1,s1=_cos(a1),_sin(a1)
         c=(220,220,220) if s%2==0 else (40,40,40)
-        pygame.draw.polygon(screen,c,[(x0,y0),(x1,y1),(x2,y2),(x3,y3)],0)
+        pygame.draw.polygon(target,c,[(cx+c0*R,cy+s0*R),(cx+c1*R,cy+s1*R),
+                                      (cx+c1*R2,cy+s1*R2),(cx+c0*R2,cy+s0*R2)],0)
     # inner square misalignment to trick depth
     s=R*0.9
     theta=t*p['speed']*0.6
     pts=[(cx+s*math.cos(theta+i*math.pi/2), cy+s*math.sin(theta+i*math.pi/2)) for i in range(4)]
-    pygame.draw.polygon(screen,(250,250,250),pts,3)
+    pygame.draw.polygon(target,(250,250,250),pts,3)
 
 # --- 24. Parallax Starfield Circle Illusion --- #
 def draw_parallax_stars(t, rnd, p):
-    w,h=screen.get_size()
+    w,h=target.get_size()
     cx,cy=w/2,h/2
     n=int(900*p['density'])
-    for i in range(n):
-        ang = rnd.random()*2*math.pi
-        r = (rnd.random()**0.6)*min(w,h)*0.45
-        x,y=polar(cx,cy, ang + 0.1*math.sin(t*p['speed']*0.6 + r*0.01), r)
-        draw_pixel(x,y,(230,230,230))
+    rng=np.random.default_rng(rnd.getrandbits(32))
+    u=rng.random((n,2))
+    ang=u[:,0]*2*math.pi
+    r=(u[:,1]**0.6)*min(w,h)*0.45
+    a=ang + 0.1*np.sin(t*p['speed']*0.6 + r*0.01)
+    draw_pixels(cx+np.cos(a)*r, cy+np.sin(a)*r, (230,230,230))
     # faint circles that seem to wobble
     for R in range(60, int(min(w,h)*0.5), 60):
-        pygame.draw.circle(screen,(100,100,100),(int(cx),int(cy)),R,1)
+        pygame.draw.circle(target,(100,100,100),(int(cx),int(cy)),R,1)
 
 # --- 25. Kaleido Rings (finale) --- #
 def draw_kaleido_rings(t, rnd, p):
-    w,h=screen.get_size()
+    w,h=target.get_size()
     cx,cy=w/2,h/2
     rings=int(60*p['density'])
-    for r in range(1,rings+1):
-        R = r*min(w,h)*0.007 + 10
-        seg = 12 + (r%6)*2
-        for k in range(seg):
-            a = k/seg*2*math.pi + t*p['speed']*0.3*(1 if r%2 else -1)
-            x,y=polar(cx,cy,a,R)
-            col=color_wheel(a*3 + r*0.2)
-            gfxdraw.pixel(screen, int(x), int(y), col)
+    seg = 12 + (np.arange(1,rings+1)%6)*2
+    r, k = ring_index(seg)
+    seg, r = seg[r], r+1
+    R = r*min(w,h)*0.007 + 10
+    a = k/seg*2*math.pi + t*p['speed']*0.3*np.where(r%2, 1, -1)
+    x,y = polar_np(cx,cy,a,R)
+    draw_pixels(x, y, color_wheel_np(a*3 + r*0.2), size=1)
 
 # -------------- Registry -------------- #
 PRESETS = [
@@ -550,30 +747,38 @@ seed_base = 1337
 running = True
 time_start = pygame.time.get_ticks()
 
-def draw_help_overlay():
-    w,h=screen.get_size()
+# Rendered overlay pieces for the current knob values; text is only
+# re-rasterized when one of them changes
+_help_cache = {}
+
+def render_help_overlay():
     pad=10
-    s=pygame.Surface((w,0), pygame.SRCALPHA)
     lines = [
         f"Preset {preset_idx+1}/25 — {PRESETS[preset_idx][0]}",
         "Controls: 1–9,0,q–o switch | [ / ] density | - / = speed | T trails | F fullscreen | H help | ESC quit",
         f"Density: {density:.2f}   Speed: {speed:.2f}   Trails: {'ON' if use_trails else 'OFF'}"
     ]
+    parts=[]
     y=10
-    for i,ln in enumerate(lines):
-        txt = bigfont.render(ln if i==0 else "", True, (0,0,0))
-        if i==0:
-            # Title badge
-            label = bigfont.render(lines[0], True, (255,255,255))
-            bg = pygame.Surface((label.get_width()+20, label.get_height()+10), pygame.SRCALPHA)
-            bg.fill((0,0,0,120))
-            screen.blit(bg,(pad,y))
-            screen.blit(label,(pad+10,y+5))
-            y += label.get_height()+16
-        else:
-            small = font.render(lines[i], True, (235,235,235))
-            screen.blit(small,(pad,y))
-            y += small.get_height()+6
+    # Title badge
+    label = bigfont.render(lines[0], True, (255,255,255))
+    bg = pygame.Surface((label.get_width()+20, label.get_height()+10), pygame.SRCALPHA)
+    bg.fill((0,0,0,120))
+    parts.append((bg,(pad,y)))
+    parts.append((label,(pad+10,y+5)))
+    y += label.get_height()+16
+    for ln in lines[1:]:
+        small = font.render(ln, True, (235,235,235))
+        parts.append((small,(pad,y)))
+        y += small.get_height()+6
+    return parts
+
+def draw_help_overlay():
+    key = (preset_idx, f"{density:.2f}", f"{speed:.2f}", use_trails)
+    if key not in _help_cache:
+        _help_cache.clear()
+        _help_cache[key] = render_help_overlay()
+    screen.blits(_help_cache[key], doreturn=False)
 
 while running:
     dt = clock.tick(60)/1000.0
@@ -585,8 +790,7 @@ while running:
             elif e.key in KEY_ORDER:
                 preset_idx = KEY_ORDER.index(e.key)
                 # reset trail
-                trail = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
-                trail.fill((0,0,0,0))
+                target.fill((6,8,12))
             elif e.key == pygame.K_LEFTBRACKET:
                 density = clamp(density-0.1, 0.4, 3.0)
             elif e.key == pygame.K_RIGHTBRACKET:
@@ -604,30 +808,27 @@ while running:
         elif e.type == pygame.VIDEORESIZE:
             W,H = e.w, e.h
             screen = pygame.display.set_mode((W,H), flags)
-            # rebuild trail surface to new size
-            trail = pygame.Surface((W,H), pygame.SRCALPHA)
-            trail.fill((0,0,0,0))
+            # rebuild full-screen layers to new size
+            target = make_target((W,H))
+            fader = make_layer((W,H), (0,0,0,24))
+            fade_soft = make_layer((W,H), (0,0,0,12))
+            ghost = make_layer((W,H))
+            _help_cache.clear()
 
     t = (pygame.time.get_ticks() - time_start)/1000.0
     params = {'density': density, 'speed': speed}
 
     if not use_trails:
-        screen.fill((6,8,12))
+        target.fill((6,8,12))
     else:
-        # composite trail then dim slightly
-        screen.blit(trail,(0,0))
-        fader = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
-        fader.fill((0,0,0,24))
-        screen.blit(fader,(0,0))
+        # dim last frame in place
+        target.blit(fader,(0,0))
 
-    # Each draw should build upon current screen; also update trail if enabled
+    # Each draw builds upon the persistent target
     local_random = random.Random(seed_base + preset_idx*999)
     name, drawer = PRESETS[preset_idx]
     drawer(t, local_random, params)
-
-    if use_trails:
-        # copy current frame into trail buffer for persistence
-        trail.blit(screen,(0,0), special_flags=pygame.BLEND_PREMULTIPLIED)
+    screen.blit(target,(0,0))
 
     if show_help:
         draw_help_overlay()